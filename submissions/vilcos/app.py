@@ -8,6 +8,9 @@ from agno.tools.file import FileTools
 import logging # Import logging
 import json
 import subprocess
+import mmap
+import re
+from contextlib import contextmanager
 
 # Optional enhanced features
 mem0_client = None
@@ -245,11 +248,237 @@ def auth_callback(username: str, password: str):
         return cl.User(identifier=username, metadata={"role": "admin"})
     return None
 
+# --- Paged File Viewer ---
+# Files are read through a read-only memory map and sent one bounded page at a
+# time, so memory use and websocket payloads stay flat regardless of file size.
+VIEW_PAGE_BYTES = 16 * 1024  # Max bytes of file content per page
+VIEW_STREAM_CHARS = 2048  # Characters per streamed token
+VIEW_SCAN_BYTES = 1024 * 1024  # Window size used when counting lines
+VIEW_MAX_SECTIONS = 20  # Max section shortcuts shown in the summary
+SECTION_PATTERN = re.compile(rb"<(header|nav|main|section|article|aside|footer)\b[^>]*>", re.IGNORECASE)
+SECTION_ID_PATTERN = re.compile(rb"""\bid\s*=\s*["']([^"']+)["']""", re.IGNORECASE)
+VIEW_LANGUAGES = {".html": "html", ".css": "css", ".js": "javascript", ".json": "json", ".svg": "xml", ".md": "markdown"}
+
+@contextmanager
+def mapped_file(full_path):
+    """Open a file as a read-only memory map (empty files yield empty bytes)."""
+    with open(full_path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            yield b""
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            yield mm
+
+def format_size(num_bytes):
+    """Format a byte count for display."""
+    for unit in ("B", "KB", "MB"):
+        if num_bytes < 1024 or unit == "MB":
+            return f"{num_bytes:.0f} {unit}" if unit == "B" else f"{num_bytes:.1f} {unit}"
+        num_bytes /= 1024
+
+def count_newlines(mm, start, end):
+    """Count newlines between two offsets, scanning in bounded windows."""
+    count = 0
+    for pos in range(start, end, VIEW_SCAN_BYTES):
+        count += mm[pos:min(pos + VIEW_SCAN_BYTES, end)].count(b"\n")
+    return count
+
+def char_boundary(mm, offset):
+    """Move an offset forward so it does not split a UTF-8 character."""
+    while offset < len(mm) and (mm[offset] & 0xC0) == 0x80:
+        offset += 1
+    return offset
+
+def line_offset(mm, line):
+    """Return the byte offset where a 1-based line starts (or EOF)."""
+    remaining = line - 1
+    pos = 0
+    while remaining > 0 and pos < len(mm):
+        window = mm[pos:pos + VIEW_SCAN_BYTES]
+        newlines = window.count(b"\n")
+        if newlines < remaining:
+            remaining -= newlines
+            pos += len(window)
+            continue
+        idx = 0
+        for _ in range(remaining):
+            idx = window.find(b"\n", idx) + 1
+        return pos + idx
+    return min(pos, len(mm))
+
+def page_end(mm, start, end_line_offset=None):
+    """Find where a page starting at `start` ends, preferring line boundaries."""
+    limit = min(start + VIEW_PAGE_BYTES, len(mm))
+    if end_line_offset is not None:
+        limit = min(limit, end_line_offset)
+    if limit >= len(mm) or limit == end_line_offset:
+        return limit
+    newline = mm.rfind(b"\n", start, limit)
+    if newline != -1:
+        return newline + 1
+    # A single line longer than a page (e.g. minified assets): split it safely
+    end = limit
+    while end > start and (mm[end] & 0xC0) == 0x80:
+        end -= 1
+    return end if end > start else limit
+
+def previous_page_start(mm, start):
+    """Find a line-aligned offset roughly one page before `start`."""
+    target = start - VIEW_PAGE_BYTES
+    if target <= 0:
+        return 0
+    # Skip the newline ending the previous line, or a long previous line would
+    # make the previous page start at `start` itself
+    newline = mm.find(b"\n", target, start - 1)
+    if newline != -1 and newline + 1 < start:
+        return newline + 1
+    return char_boundary(mm, target)
+
+def count_lines(mm):
+    """Count lines in a mapped file, including a final line without a newline."""
+    size = len(mm)
+    lines = count_newlines(mm, 0, size)
+    if size and mm[size - 1] != ord("\n"):
+        lines += 1
+    return lines
+
+def count_file_lines(full_path):
+    """Return the number of lines in a file."""
+    with mapped_file(full_path) as mm:
+        return count_lines(mm)
+
+def summarize_file(full_path):
+    """Return size, line count and section shortcuts for a file."""
+    with mapped_file(full_path) as mm:
+        size = len(mm)
+        lines = count_lines(mm)
+        sections = []
+        if full_path.suffix.lower() in (".html", ".svg"):
+            prev_offset, line = 0, 1
+            for match in SECTION_PATTERN.finditer(mm):
+                if len(sections) >= VIEW_MAX_SECTIONS:
+                    break
+                line += count_newlines(mm, prev_offset, match.start())
+                prev_offset = match.start()
+                offset = mm.rfind(b"\n", 0, match.start()) + 1
+                id_match = SECTION_ID_PATTERN.search(match.group(0))
+                label = match.group(1).decode().lower()
+                if id_match:
+                    label += f"#{id_match.group(1).decode('utf-8', errors='replace')}"
+                sections.append({"label": label, "offset": offset, "line": line})
+    return {"size": size, "lines": lines, "sections": sections}
+
+def read_file_page(full_path, offset=0, line=None, end_offset=None, jump_line=None, end_line=None):
+    """
+    Read one bounded page of a file starting at a byte offset or, with
+    `jump_line`, at a line. `line` is the known line number at `offset`; the
+    file is only rescanned when it is missing or does not fit the offset.
+    `end_offset` and `end_line` cap where the page may end.
+    Returns the decoded text plus the offsets and line numbers needed for paging.
+    """
+    with mapped_file(full_path) as mm:
+        size = len(mm)
+        if jump_line is not None:
+            offset = line_offset(mm, jump_line)
+            line = jump_line
+        else:
+            offset = char_boundary(mm, min(max(offset, 0), size))
+            at_line_start = offset == 0 or mm[offset - 1] == ord("\n")
+            if not isinstance(line, int) or line < 1 or (offset == 0 and line != 1) or not at_line_start:
+                line = 1 + count_newlines(mm, 0, offset)
+        range_end = line_offset(mm, end_line + 1) if end_line else None
+        end_limit = range_end
+        if end_offset is not None and end_offset > offset:
+            end_limit = min(end_offset, end_limit) if end_limit is not None else end_offset
+        end = page_end(mm, offset, end_limit)
+        text = mm[offset:end].decode("utf-8", errors="replace")
+        prev_offset = previous_page_start(mm, offset) if offset > 0 else None
+        prev_line = line - count_newlines(mm, prev_offset, offset) if prev_offset is not None else None
+    last_line = line + max(text.count("\n") - (1 if text.endswith("\n") else 0), 0)
+    return {
+        "text": text,
+        "size": size,
+        "start": offset,
+        "end": end,
+        "line": line,
+        "last_line": last_line,
+        "next": (
+            {"offset": end, "line": line + text.count("\n"), "end_line": end_line}
+            if end < size and (range_end is None or end < range_end) else None
+        ),
+        "prev": (
+            {"offset": prev_offset, "line": prev_line, "end": offset, "end_line": end_line}
+            if prev_offset is not None and prev_offset < offset else None
+        ),
+    }
+
+def page_action(page_name, label, offset, line, description, end=None, end_line=None):
+    """Create an action that opens a page of a file at a given offset."""
+    payload = {"file": page_name, "offset": offset, "line": line}
+    if end is not None:
+        payload["end"] = end
+    if end_line is not None:
+        payload["end_line"] = end_line
+    return cl.Action(
+        name="view_page_chunk",
+        value=page_name,
+        description=description,
+        label=label,
+        payload=payload
+    )
+
+def resolve_view_target(page_name):
+    """Return the path of a viewable file inside the templates directory, or None."""
+    full_path = (TEMPLATES_DIR / page_name).resolve()
+    if TEMPLATES_DIR.resolve() not in full_path.parents:
+        return None
+    return full_path if full_path.is_file() else None
+
+async def send_file_page(page_name, full_path, offset=0, line=None, end_offset=None, jump_line=None, end_line=None):
+    """Stream one page of a file to the UI with navigation actions."""
+    try:
+        page = read_file_page(full_path, offset=offset, line=line, end_offset=end_offset,
+                              jump_line=jump_line, end_line=end_line)
+    except (OSError, ValueError) as e:
+        logging.error(f"Error reading {page_name} for view: {e}")
+        await cl.Message(content=f"❌ Could not read {page_name}: {str(e)}").send()
+        return
+    language = VIEW_LANGUAGES.get(full_path.suffix.lower(), "text")
+
+    actions = []
+    if page["prev"]:
+        actions.append(page_action(page_name, "⬅️ Previous", page["prev"]["offset"], page["prev"]["line"],
+                                   f"Previous page of {page_name}", end=page["prev"]["end"],
+                                   end_line=page["prev"]["end_line"]))
+    if page["next"]:
+        actions.append(page_action(page_name, "➡️ Next", page["next"]["offset"], page["next"]["line"],
+                                   f"Next page of {page_name}", end_line=page["next"]["end_line"]))
+    actions.append(cl.Action(
+        name="view_page_lines",
+        value=page_name,
+        description=f"Jump to a line range in {page_name}",
+        label="🔢 Go to lines",
+        payload={"file": page_name}
+    ))
+
+    page_message = cl.Message(content="", actions=actions)
+    await page_message.stream_token(
+        f"**{page_name}** — lines {page['line']}–{page['last_line']} "
+        f"(bytes {page['start']:,}–{page['end']:,} of {page['size']:,}):\n```{language}\n"
+    )
+    text = page["text"]
+    for i in range(0, len(text), VIEW_STREAM_CHARS):
+        await page_message.stream_token(text[i:i + VIEW_STREAM_CHARS])
+    await page_message.stream_token("\n```" if not text.endswith("\n") else "```")
+    await page_message.send()
+
+# --- End Paged File Viewer ---
+
 # --- Specific Action Callbacks --- 
 
 @cl.action_callback("view_page")
 async def handle_view_page(action):
-    """Handles the 'view_page' action."""
+    """Handles the 'view_page' action: shows a file summary, then its first page."""
     payload = action.payload
     page_name = payload.get("file")
 
@@ -258,15 +487,103 @@ async def handle_view_page(action):
         await cl.Message(content="Error: Missing file name for view action.").send()
         return
         
-    full_path = TEMPLATES_DIR / page_name
+    full_path = resolve_view_target(page_name)
     
-    if full_path.exists() and full_path.is_file():
-        content = full_path.read_text()
-        await cl.Message(content=f"Content of **{page_name}**:\n```html\n{content}\n```").send()
+    if full_path:
+        try:
+            summary = summarize_file(full_path)
+        except (OSError, ValueError) as e:
+            logging.error(f"Error reading {page_name} for view: {e}")
+            await cl.Message(content=f"❌ Could not read {page_name}: {str(e)}").send()
+            return
+        pages = max(-(-summary["size"] // VIEW_PAGE_BYTES), 1)
+        content = (
+            f"📄 **{page_name}** — {format_size(summary['size'])}, "
+            f"{summary['lines']:,} lines, ~{pages} page{'s' if pages != 1 else ''}"
+        )
+        section_actions = [
+            page_action(page_name, f"§ {s['label']} (line {s['line']})", s["offset"], s["line"],
+                        f"Jump to <{s['label']}> in {page_name}")
+            for s in summary["sections"]
+        ]
+        if section_actions:
+            content += "\n\nJump to a section:"
+        await cl.Message(content=content, actions=section_actions).send()
+        await send_file_page(page_name, full_path)
     else:
         logging.warning(f"File not found for view action: {page_name}")
         await cl.Message(content=f"File {page_name} not found").send()
 
+@cl.action_callback("view_page_chunk")
+async def handle_view_page_chunk(action):
+    """Handles paging and section jumps within a viewed file."""
+    payload = action.payload
+    page_name = payload.get("file")
+    full_path = resolve_view_target(page_name) if page_name else None
+
+    if not full_path:
+        logging.warning(f"File not found for page action: {page_name}")
+        await cl.Message(content=f"File {page_name} not found").send()
+        return
+
+    def payload_int(key):
+        try:
+            return int(payload[key])
+        except (KeyError, TypeError, ValueError):
+            return None
+
+    await send_file_page(
+        page_name,
+        full_path,
+        offset=payload_int("offset") or 0,
+        line=payload_int("line"),
+        end_offset=payload_int("end"),
+        end_line=payload_int("end_line")
+    )
+
+@cl.action_callback("view_page_lines")
+async def handle_view_page_lines(action):
+    """Handles jumping to a line or line range within a viewed file."""
+    payload = action.payload
+    page_name = payload.get("file")
+    full_path = resolve_view_target(page_name) if page_name else None
+
+    if not full_path:
+        logging.warning(f"File not found for line jump action: {page_name}")
+        await cl.Message(content=f"File {page_name} not found").send()
+        return
+
+    response = await cl.AskUserMessage(
+        content=f"Which lines of **{page_name}** would you like to see? (e.g. `120` or `120-180`)",
+        timeout=120
+    ).send()
+    if not response:
+        return
+
+    match = re.fullmatch(r"\s*(\d+)\s*(?:[-–:]\s*(\d+))?\s*", response.get("output", ""))
+    if not match:
+        await cl.Message(content="Please enter a line number or a range like `120-180`.").send()
+        return
+
+    start_line = int(match.group(1))
+    end_line = int(match.group(2)) if match.group(2) else None
+    if end_line is not None and end_line < start_line:
+        start_line, end_line = end_line, start_line
+    start_line = max(start_line, 1)
+
+    try:
+        total_lines = count_file_lines(full_path)
+    except (OSError, ValueError) as e:
+        logging.error(f"Error reading {page_name} for view: {e}")
+        await cl.Message(content=f"❌ Could not read {page_name}: {str(e)}").send()
+        return
+    if start_line > total_lines:
+        await cl.Message(
+            content=f"{page_name} has only {total_lines:,} line{'s' if total_lines != 1 else ''}."
+        ).send()
+        return
+    await send_file_page(page_name, full_path, jump_line=start_line, end_line=end_line)
+
 @cl.action_callback("edit_page")
 async def handle_edit_page(action):
     """Handles the 'edit_page' action."""